@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.functional import cached_property
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from core.models.base import SoftDeleteModel
 
@@ -51,10 +52,28 @@ class CustomUser(AbstractBaseUser, SoftDeleteModel, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
     
+    @cached_property
+    def is_super_admin(self):
+        """Superusers and users with the super_admin role can access every merchant"""
+        return self.is_superuser or (self.role or '').lower() == 'super_admin'
+
+    @cached_property
+    def is_admin_or_super_admin(self):
+        """Users allowed to manage accounts and settlements: super admins and the admin role"""
+        return self.is_super_admin or (self.role or '').lower() == 'admin'
+
     def get_accessible_merchant_ids(self):
-        """Return list of merchant IDs this user can access"""
-        if self.is_superuser or (self.role and self.role.lower() == 'super_admin'):
-            # Superusers and super_admin can access all merchants
-            from merchants.models import Merchant
-            return list(Merchant.objects.filter(deleted_at=None).values_list('id', flat=True))
-        return list(self.merchants.filter(deleted_at=None).values_list('id', flat=True))
\ No newline at end of file
+        """
+        Return list of merchant IDs this user can access.
+        Cached on the instance, so repeated calls within a request share one query.
+        """
+        cached = getattr(self, '_accessible_merchant_ids', None)
+        if cached is None:
+            if self.is_super_admin:
+                # Superusers and super_admin can access all merchants
+                from merchants.models import Merchant
+                cached = list(Merchant.objects.filter(deleted_at=None).values_list('id', flat=True))
+            else:
+                cached = list(self.merchants.filter(deleted_at=None).values_list('id', flat=True))
+            self._accessible_merchant_ids = cached
+        return list(cached)
\ No newline at end of file
@@ -75,8 +75,7 @@ class UserListView(APIView):
 
         # Filter by merchant access (multi-tenant)
         # If user is not super_admin, only show users that share at least one merchant
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role == 'super_admin'):
+        if not request.user.is_super_admin:
             # Get current user's accessible merchant IDs
             current_user_merchant_ids = request.user.get_accessible_merchant_ids()
 
@@ -99,11 +98,7 @@ class UserCreateView(APIView):
     def post(self, request):
         """Create a new user"""
         # Check if user is admin or superuser
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_superuser = request.user.is_superuser
-        is_super_admin = user_role == 'super_admin'
-
-        if not (is_superuser or is_super_admin):
+        if not request.user.is_super_admin:
             user_role_display = request.user.role or 'None'
             return Response(
                 {
@@ -143,12 +138,7 @@ class UserUpdateStatusView(APIView):
     def patch(self, request, user_id):
         """Update user is_active status"""
         # Check if user is admin, super_admin, or superuser
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_admin = user_role == 'admin'
-        is_super_admin = user_role == 'super_admin'
-        is_superuser = request.user.is_superuser
-
-        if not (is_admin or is_super_admin or is_superuser):
+        if not request.user.is_admin_or_super_admin:
             return Response(
                 {
                     'error': {
@@ -182,12 +172,7 @@ class UserUpdateView(APIView):
     def patch(self, request, user_id):
         """Update user information (general info or merchants)"""
         # Check if user is admin, super_admin, or superuser
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_admin = user_role == 'admin'
-        is_super_admin = user_role == 'super_admin'
-        is_superuser = request.user.is_superuser
-
-        if not (is_admin or is_super_admin or is_superuser):
+        if not request.user.is_admin_or_super_admin:
             return Response(
                 {
                     'error': {
@@ -135,6 +135,7 @@ def process_csv_transactions(csv_path: str, bank_account_id: int) -> list:
                 # Create transaction object
                 transactions.append(ExtractedTransactions(
                     bank_account=bank_account,
+                    merchant_id=bank_account.merchant_id,
                     amount=amount,
                     utr=utr
                 ))
@@ -191,7 +192,7 @@ async def save_extracted_transactions(transactions: list) -> dict:
                 }
 
             # Bulk create new transactions
-            ExtractedTransactions.objects.bulk_create(new_transactions, ignore_conflicts=True)
+            ExtractedTransactions.objects.bulk_create(new_transactions, batch_size=1000, ignore_conflicts=True)
 
             return {
                 "saved": len(new_transactions),
@@ -12,16 +12,13 @@ from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from channels.layers import get_channel_layer
-import redis
+from core.utils.redis_client import redis_client
 
 # Get the directory where this bot file is located
 BOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 logger = logging.getLogger(__name__)
 
-# Redis client for checking stop flag
-redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
-
 # Get bot execution interval from settings (default: 30 seconds)
 BOT_INTERVAL = getattr(settings, 'BOT_EXECUTION_INTERVAL', 30)
 
@@ -301,7 +298,7 @@ async def save_extracted_transactions(transactions: list) -> dict:
                 }
 
             # Bulk create new transactions
-            ExtractedTransactions.objects.bulk_create(new_transactions, ignore_conflicts=True)
+            ExtractedTransactions.objects.bulk_create(new_transactions, batch_size=1000, ignore_conflicts=True)
 
             return {
                 "saved": len(new_transactions),
@@ -13,18 +13,19 @@ from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from channels.layers import get_channel_layer
-import redis
+from core.utils.redis_client import redis_client
 import os
 
 logger = logging.getLogger(__name__)
 
 BOT_DIR = os.path.dirname(os.path.abspath(__file__))
 OCR_MODEL = easyocr.Reader(['en'], gpu=False)
-redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
 BOT_INTERVAL = getattr(settings, 'BOT_EXECUTION_INTERVAL', 30)
 
 MAX_RELOGIN_ATTEMPTS = 5
 RELOGIN_DELAY_SECONDS = 3
+# Log the full traceback only on the 1st, (N+1)th, ... consecutive iteration failure
+ITERATION_TRACEBACK_EVERY = 10
 
 
 class BotStoppedException(Exception):
@@ -285,7 +286,7 @@ async def save_extracted_transactions(transactions: list) -> dict:
                 logger.info("All transactions already exist in DB")
                 return {"saved": 0, "skipped": len(transactions), "errors": 0}
 
-            ExtractedTransactions.objects.bulk_create(new_transactions, ignore_conflicts=True)
+            ExtractedTransactions.objects.bulk_create(new_transactions, batch_size=1000, ignore_conflicts=True)
             return {
                 "saved": len(new_transactions),
                 "skipped": len(transactions) - len(new_transactions),
@@ -805,6 +806,7 @@ async def run_bot_for_account(bank_account_id: int):
 
                 # ── MAIN LOOP ──────────────────────────────────────────────
                 iteration = 0
+                consecutive_errors = 0
                 while True:
                     iteration += 1
                     logger.info(f"=== Iteration {iteration} — account {bank_account_id} ===")
@@ -828,11 +830,18 @@ async def run_bot_for_account(bank_account_id: int):
 
                         verify_result = await verify_transactions(send_status)
                         logger.info(f"Iteration {iteration} verification result: {verify_result}")
+                        consecutive_errors = 0
 
                     except BotStoppedException:
                         raise
                     except Exception as e:
-                        logger.error(f"Iteration {iteration} error: {e}", exc_info=True)
+                        consecutive_errors += 1
+                        # A persistently failing bot raises the same error every iteration;
+                        # only render the traceback periodically instead of every time
+                        logger.error(
+                            f"Iteration {iteration} error ({consecutive_errors} consecutive): {e}",
+                            exc_info=consecutive_errors % ITERATION_TRACEBACK_EVERY == 1,
+                        )
                         await send_status('error', f'Iteration {iteration} error: {e}')
                         await save_screenshot(page, f"iteration_error_acc{bank_account_id}_iter{iteration}")
 
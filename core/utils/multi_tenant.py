@@ -17,7 +17,7 @@ def filter_by_user_merchants(queryset: QuerySet, user: CustomUser, merchant_fiel
     Returns:
         Filtered queryset
     """
-    if user.is_superuser or (user.role and user.role.lower() == 'super_admin'):
+    if user.is_super_admin:
         # Superusers and super_admin can see all merchants
         return queryset
     
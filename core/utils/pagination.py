@@ -0,0 +1,65 @@
+"""
+Utility functions for paginating list endpoints
+"""
+from typing import List, Tuple
+
+from django.db.models import QuerySet
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def get_page_params(params) -> Tuple[int, int]:
+    """
+    Read the page and page_size query parameters.
+
+    Missing or non-integer values fall back to page 1 and the default page size;
+    page_size is capped at MAX_PAGE_SIZE.
+
+    Args:
+        params: The request's query params (QueryDict)
+
+    Returns:
+        Tuple[int, int]: The page number and page size
+    """
+    try:
+        page = int(params.get('page', 1))
+        page_size = int(params.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return 1, DEFAULT_PAGE_SIZE
+
+    if page < 1:
+        page = 1
+    if page_size < 1:
+        page_size = DEFAULT_PAGE_SIZE
+    if page_size > MAX_PAGE_SIZE:
+        page_size = MAX_PAGE_SIZE
+    return page, page_size
+
+
+def paginate(queryset: QuerySet, page: int, page_size: int) -> Tuple[List, int]:
+    """
+    Fetch one page of a queryset along with the total row count.
+
+    A partially filled page already tells us the total, so the COUNT query
+    only runs when it can't be derived from the fetched page.
+
+    Args:
+        queryset: The ordered queryset to paginate
+        page: 1-based page number
+        page_size: Number of rows per page
+
+    Returns:
+        Tuple[List, int]: The rows on the requested page and the total count
+    """
+    start_index = (page - 1) * page_size
+    results = list(queryset[start_index:start_index + page_size])
+
+    if results and len(results) < page_size:
+        total_count = start_index + len(results)
+    elif not results and page == 1:
+        total_count = 0
+    else:
+        total_count = queryset.count()
+
+    return results, total_count
@@ -0,0 +1,27 @@
+"""
+Utility functions for parsing request query parameters
+"""
+from typing import Optional
+
+
+def get_int_param(params, key: str) -> Optional[int]:
+    """
+    Read an integer query parameter.
+
+    Args:
+        params: The request's query params (QueryDict)
+        key: Name of the query parameter
+
+    Returns:
+        Optional[int]: The parsed value, or None if the parameter is missing or empty
+
+    Raises:
+        ValueError: If the parameter is present but not an integer
+    """
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {key} format")
@@ -0,0 +1,13 @@
+"""
+Shared Redis client for bot locks, stop flags and short-lived caches
+"""
+import redis
+from django.conf import settings
+
+# Single client (and connection pool) per process, shared by views, tasks and bots
+redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+
+# Sets indexing every bot lock / stop flag key that has been set, so startup
+# cleanup can find them without enumerating the keyspace
+ACTIVE_BOT_LOCKS_KEY = 'active_bot_locks'
+ACTIVE_BOT_STOP_FLAGS_KEY = 'active_bot_stop_flags'
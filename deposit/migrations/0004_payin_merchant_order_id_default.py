@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:31
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deposit', '0003_payin_utr_submitted_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='payin',
+            name='merchant_order_id',
+            field=models.UUIDField(default=uuid.uuid4, help_text="Merchant's order ID (UUID, unique per payin)", unique=True),
+        ),
+    ]
@@ -76,6 +76,7 @@ class Payin(SoftDeleteModel):
     
     # Merchant order information
     merchant_order_id = models.UUIDField(
+        default=uuid.uuid4,
         unique=True,
         help_text="Merchant's order ID (UUID, unique per payin)"
     )
@@ -95,16 +95,15 @@ class PayinCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         """Create a new payin with auto-generated code"""
-        # Generate a unique code if not provided
-        import random
-        import string
-        
-        while True:
-            code = ''.join(random.choices(string.ascii_letters + string.digits, k=5))
-            if not Payin.objects.filter(code=code).exists():
-                validated_data['code'] = code
-                break
-        
+        from .utils import generate_unique_payin_code
+
+        code = generate_unique_payin_code()
+        if code is None:
+            raise serializers.ValidationError({
+                'code': 'Failed to generate unique code. Please try again.'
+            })
+        validated_data['code'] = code
+
         return super().create(validated_data)
 
 
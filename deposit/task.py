@@ -1,12 +1,11 @@
 from celery import shared_task
-from django.conf import settings
-import redis
 import logging
+from core.utils.redis_client import redis_client, ACTIVE_BOT_LOCKS_KEY, ACTIVE_BOT_STOP_FLAGS_KEY
 
 logger = logging.getLogger(__name__)
 
-# Connect to Redis (using same connection as Celery)
-redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+# Per-account bot lock lifetime (safety measure; the task releases it when done)
+BOT_LOCK_TIMEOUT = 86400  # 24 hours
 
 
 @shared_task(name='deposit.task.run_bot')
@@ -53,12 +52,17 @@ def run_single_bot(self, bank_account_id):
     """
     lock_key = f'celery_task_run_bot_lock_{bank_account_id}'
     stop_flag_key = f'bot_stop_flag_{bank_account_id}'
-    lock_timeout = 86400  # Lock expires after 24 hours (safety measure)
 
-    # Try to acquire lock atomically
-    lock_acquired = redis_client.set(lock_key, self.request.id, nx=True, ex=lock_timeout)
+    # Try to acquire lock atomically. StartBotView takes the lock under this
+    # task's id before queueing it, so a lock holding our own id is ours.
+    lock_acquired, _ = (
+        redis_client.pipeline()
+        .set(lock_key, self.request.id, nx=True, ex=BOT_LOCK_TIMEOUT)
+        .sadd(ACTIVE_BOT_LOCKS_KEY, lock_key)
+        .execute()
+    )
 
-    if not lock_acquired:
+    if not lock_acquired and redis_client.get(lock_key) != self.request.id:
         logger.info(f"Bot for bank account {bank_account_id} is already running.")
         return f"Bot for account {bank_account_id} already running"
 
@@ -107,6 +111,11 @@ def run_single_bot(self, bank_account_id):
 
     finally:
         # Always release the lock and clean up stop flag when done
-        redis_client.delete(lock_key)
-        redis_client.delete(stop_flag_key)
+        (
+            redis_client.pipeline()
+            .delete(lock_key, stop_flag_key)
+            .srem(ACTIVE_BOT_LOCKS_KEY, lock_key)
+            .srem(ACTIVE_BOT_STOP_FLAGS_KEY, stop_flag_key)
+            .execute()
+        )
         logger.info(f"Lock and stop flag released for bank account {bank_account_id}.")
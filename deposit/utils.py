@@ -1,12 +1,86 @@
 """
 Utility functions for deposit/payin operations
 """
+import hashlib
+import hmac
 import logging
+import secrets
+import string
 import requests
+from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+PAYIN_CODE_ALPHABET = string.ascii_letters + string.digits
+PAYIN_CODE_LENGTH = 5
+TWO_PLACES = Decimal('0.01')
+
+
+def generate_unique_payin_code(batch_size: int = 16, max_batches: int = 5) -> Optional[str]:
+    """
+    Generate a payin code that is not already in use.
+
+    Candidates are generated in batches and checked against the database with
+    a single query per batch, instead of one existence query per candidate.
+
+    Args:
+        batch_size: Number of candidate codes checked per query
+        max_batches: Maximum number of batches to try
+
+    Returns:
+        Optional[str]: An unused code, or None if every candidate was taken
+    """
+    from deposit.models import Payin
+
+    for _ in range(max_batches):
+        candidates = {
+            ''.join(secrets.choice(PAYIN_CODE_ALPHABET) for _ in range(PAYIN_CODE_LENGTH))
+            for _ in range(batch_size)
+        }
+        # Soft-deleted payins still hold their code under the unique constraint
+        taken = set(Payin.all_objects.filter(code__in=candidates).values_list('code', flat=True))
+        available = candidates - taken
+        if available:
+            return available.pop()
+    return None
+
+
+def format_amount(value) -> str:
+    """
+    Format a monetary amount as a fixed two-decimal string (e.g. '1250.50').
+
+    Aggregates can come back with no scale or extra digits depending on the
+    database (SQLite '300', PostgreSQL '6.000000'); this keeps API output uniform.
+    """
+    return format(Decimal(value).quantize(TWO_PLACES, rounding=ROUND_HALF_UP), 'f')
+
+
+def sign_payin_session(payin_uuid, api_key: str) -> str:
+    """
+    Sign a payment session id with the merchant's API key (HMAC-SHA256).
+
+    Args:
+        payin_uuid: The payin UUID used as the payment page sessionId
+        api_key: The merchant's API key
+
+    Returns:
+        str: Hex digest used as the payment link's sign parameter
+    """
+    return hmac.new(api_key.encode(), str(payin_uuid).encode(), hashlib.sha256).hexdigest()
+
+
+def verify_payin_session_sign(payin_uuid, api_key: str, sign: Optional[str]) -> bool:
+    """
+    Check a payment link's sign parameter in constant time.
+
+    Returns:
+        bool: True if sign matches the signature for this session
+    """
+    if not sign:
+        return False
+    return hmac.compare_digest(sign_payin_session(payin_uuid, api_key), sign)
+
 
 def send_merchant_callback(payin) -> bool:
     """
@@ -1,13 +1,24 @@
+import logging
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum, Count, F, DecimalField, Sum
+from django.http import Http404
+from django.db.models import Q, Sum, Count, F, DecimalField, Prefetch
 from django.db.models.functions import TruncDate, TruncHour
 from .models import Payin
 from merchants.models import Merchant, BankAccount
 from core.utils.multi_tenant import filter_by_user_merchants
+from core.utils.query_params import get_int_param
+from core.utils.pagination import get_page_params, paginate
+from .utils import (
+    format_amount,
+    generate_unique_payin_code,
+    send_merchant_callback,
+    sign_payin_session,
+    verify_payin_session_sign,
+)
 from .serializer import (
     PayinSerializer,
     PayinCreateSerializer,
@@ -17,16 +28,14 @@ from .serializer import (
 )
 from merchants.models import ExtractedTransactions
 from settlements.models import Settlement
-import random
-import string
-import uuid
-import os
-from decimal import Decimal
-import hashlib
+from django.conf import settings
+from decimal import Decimal, InvalidOperation
 from datetime import timedelta, date
 from urllib.parse import urlencode
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 class PayinListView(APIView):
     """
@@ -38,7 +47,7 @@ class PayinListView(APIView):
 
     def get(self, request):
         """Get list of all payins with optional filtering and pagination"""
-        queryset = Payin.objects.all()
+        queryset = Payin.objects.select_related('merchant')
 
         # Filter by user's accessible merchants (multi-tenant)
         queryset = filter_by_user_merchants(queryset, request.user, 'merchant')
@@ -69,8 +78,7 @@ class PayinListView(APIView):
             try:
                 merchant_id_int = int(merchant_id)
                 # Verify user has access to this merchant
-                user_role = request.user.role.lower() if request.user.role else ''
-                if not (request.user.is_superuser or user_role == 'super_admin'):
+                if not request.user.is_super_admin:
                     merchant_ids = request.user.get_accessible_merchant_ids()
                     if merchant_id_int not in merchant_ids:
                         return Response({
@@ -118,31 +126,11 @@ class PayinListView(APIView):
         # Order by created_at descending (newest first)
         queryset = queryset.order_by('-created_at')
 
-        # Get total count before pagination
-        total_count = queryset.count()
-
         # Pagination
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        try:
-            page = int(page)
-            page_size = int(page_size)
-            if page < 1:
-                page = 1
-            if page_size < 1:
-                page_size = 20
-            if page_size > 100:
-                page_size = 100  # Max page size limit
-        except ValueError:
-            page = 1
-            page_size = 20
-
-        # Calculate pagination offsets
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        queryset = queryset[start_index:end_index]
-
-        serializer = PayinListSerializer(queryset, many=True)
+        page, page_size = get_page_params(request.query_params)
+        results, total_count = paginate(queryset, page, page_size)
+
+        serializer = PayinListSerializer(results, many=True)
 
         # Calculate total pages
         total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
@@ -226,19 +214,32 @@ class PayinCheckStatusView(APIView):
     """
     API view for checking the status of a payin.
     POST: Check and return current status
+    Query params:
+    - include (optional): 'full_data' to also return the full serialized payin
     """
     permission_classes = [IsAuthenticated]
 
+    # Columns needed for the status response and calculate_duration()
+    status_fields = (
+        'id', 'payin_uuid', 'status', 'confirmed_amount', 'utr',
+        'user_submitted_utr', 'utr_submitted_at', 'duration', 'updated_at',
+    )
+
     def post(self, request, pk):
         """Check the status of a payin"""
-        payin = get_object_or_404(Payin, pk=pk)
+        include = request.query_params.get('include', '').split(',')
+        full_data = 'full_data' in include
+        if full_data:
+            payins = Payin.objects.select_related('merchant')
+        else:
+            payins = Payin.objects.only(*self.status_fields)
+        payin = get_object_or_404(payins, pk=pk)
 
         # If status is success, ensure duration is calculated
         if payin.status == 'success':
             payin.calculate_duration()
 
-        serializer = PayinSerializer(payin)
-        return Response({
+        response_data = {
             'id': payin.id,
             'payin_uuid': str(payin.payin_uuid),
             'status': payin.status,
@@ -247,8 +248,13 @@ class PayinCheckStatusView(APIView):
             'user_submitted_utr': payin.user_submitted_utr,
             'duration': payin.get_duration_display(),
             'updated_at': payin.updated_at,
-            'full_data': serializer.data
-        }, status=status.HTTP_200_OK)
+        }
+
+        # The full serialized payin is only built on request (?include=full_data)
+        if full_data:
+            response_data['full_data'] = PayinSerializer(payin).data
+
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class PayinResetView(APIView):
@@ -260,7 +266,7 @@ class PayinResetView(APIView):
 
     def post(self, request, pk):
         """Reset a payin"""
-        payin = get_object_or_404(Payin, pk=pk)
+        payin = get_object_or_404(Payin.objects.select_related('merchant'), pk=pk)
 
         # Reset payin to initiated status
         payin.status = 'initiated'
@@ -268,7 +274,7 @@ class PayinResetView(APIView):
         payin.utr = None
         payin.user_submitted_utr = None
         payin.duration = None
-        payin.save()
+        payin.save(update_fields=['status', 'confirmed_amount', 'utr', 'user_submitted_utr', 'duration'])
 
         serializer = PayinSerializer(payin)
         return Response({
@@ -394,22 +400,39 @@ class PayinActionsView(APIView):
     """
     Combined API view for payin actions (check status, reset, notify).
     POST: Perform an action on a payin
+    Query params:
+    - include (optional): 'data' to also return the full serialized payin
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk, action):
         """Perform an action on a payin"""
-        payin = get_object_or_404(Payin, pk=pk)
+        if action not in ('check_status', 'reset', 'notify'):
+            return Response({
+                'error': f'Invalid action: {action}. Valid actions are: check_status, reset, notify'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        include = request.query_params.get('include', '').split(',')
+        include_data = 'data' in include
+
+        if action == 'notify' and not include_data:
+            # Nothing is sent from here, so only confirm the payin exists
+            if not Payin.objects.filter(pk=pk).exists():
+                raise Http404
+            return Response({
+                'action': 'notify',
+                'message': f'Notification sent for payin {pk}',
+            }, status=status.HTTP_200_OK)
+
+        payin = get_object_or_404(Payin.objects.select_related('merchant'), pk=pk)
 
         if action == 'check_status':
             if payin.status == 'success':
                 payin.calculate_duration()
-            serializer = PayinSerializer(payin)
-            return Response({
+            response_data = {
                 'action': 'check_status',
                 'status': payin.status,
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
+            }
 
         elif action == 'reset':
             payin.status = 'initiated'
@@ -417,26 +440,23 @@ class PayinActionsView(APIView):
             payin.utr = None
             payin.user_submitted_utr = None
             payin.duration = None
-            payin.save()
-            serializer = PayinSerializer(payin)
-            return Response({
+            payin.save(update_fields=['status', 'confirmed_amount', 'utr', 'user_submitted_utr', 'duration'])
+            response_data = {
                 'action': 'reset',
                 'message': 'Payin reset successfully',
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
+            }
 
-        elif action == 'notify':
-            serializer = PayinSerializer(payin)
-            return Response({
+        else:
+            response_data = {
                 'action': 'notify',
                 'message': f'Notification sent for payin {payin.id}',
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
+            }
 
-        else:
-            return Response({
-                'error': f'Invalid action: {action}. Valid actions are: check_status, reset, notify'
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # The full serialized payin is only built on request (?include=data)
+        if include_data:
+            response_data['data'] = PayinSerializer(payin).data
+
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class PayinCreatePaymentLinkView(APIView):
@@ -459,9 +479,8 @@ class PayinCreatePaymentLinkView(APIView):
             }, status=status.HTTP_401_UNAUTHORIZED)
 
         # Validate API key and get merchant
-        try:
-            merchant = Merchant.objects.get(api_key=api_key, deleted_at=None)
-        except Merchant.DoesNotExist:
+        merchant = Merchant.get_by_api_key(api_key)
+        if merchant is None:
             return Response({
                 'error': 'Invalid API key'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -484,27 +503,18 @@ class PayinCreatePaymentLinkView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # 2. Check if merchant has at least one enabled bank account
-        enabled_bank_accounts = merchant.bank_accounts.filter(
+        bank_account = merchant.bank_accounts.filter(
             status=True,
             deleted_at=None
-        )
+        ).only('id', 'nickname', 'account_holder_name').first()
 
-        if not enabled_bank_accounts.exists():
+        if not bank_account:
             return Response({
                 'error': 'Cannot create payment link. No enabled bank accounts found for this merchant. Please enable at least one bank account first.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Get the first enabled bank account
-        bank_account = enabled_bank_accounts.first()
-
-        # Generate a unique code - keep trying until we find one that doesn't exist
-        max_attempts = 100  # Safety limit to prevent infinite loops
-        code = None
-        for attempt in range(max_attempts):
-            candidate_code = ''.join(random.choices(string.ascii_letters + string.digits, k=5))
-            if not Payin.objects.filter(code=candidate_code).exists():
-                code = candidate_code
-                break
+        # Generate a unique code
+        code = generate_unique_payin_code()
 
         if code is None:
             return Response({
@@ -512,41 +522,41 @@ class PayinCreatePaymentLinkView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # Set pay_amount from amount if provided, otherwise use 0
-        pay_amount = request.data.get('amount') if request.data.get('amount') else None
+        pay_amount = request.data.get('amount') or None
         if pay_amount:
             try:
-                pay_amount = Decimal(str(pay_amount))
-            except (ValueError, TypeError):
+                # str/int convert exactly; floats go through str() to avoid binary expansion
+                pay_amount = Decimal(pay_amount) if isinstance(pay_amount, (str, int)) else Decimal(str(pay_amount))
+            except (ValueError, TypeError, InvalidOperation):
                 pay_amount = Decimal('0.00')
 
-        # Generate payin_uuid first
-        payin_uuid = uuid.uuid4()
-
-        # Generate signature (simple hash of sessionId + merchant API key)
-        # In production, use a more secure signing mechanism
-        sign_string = f"{payin_uuid}{merchant.api_key}"
-        sign = hashlib.md5(sign_string.encode()).hexdigest()
+        # payin_uuid and (when not supplied) merchant_order_id come from the model defaults
+        payin_fields = {
+            'code': code,
+            'merchant': merchant,
+            'user': user_id,
+            'bank': bank_account.nickname or bank_account.account_holder_name,
+            'status': 'initiated',
+            'pay_amount': pay_amount,
+            'user_submitted_utr': '-',
+        }
+        if merchant_order_id:
+            payin_fields['merchant_order_id'] = merchant_order_id
 
         try:
-            deposit = Payin.objects.create(
-                code=code,
-                merchant_order_id=merchant_order_id or uuid.uuid4(),
-                merchant=merchant,
-                user=user_id,
-                bank=bank_account.nickname or bank_account.account_holder_name,
-                status='initiated',
-                payin_uuid=payin_uuid,
-                pay_amount=pay_amount,
-                user_submitted_utr='-',
-            )
+            deposit = Payin.objects.create(**payin_fields)
         except Exception as e:
             return Response({
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        payin_uuid = deposit.payin_uuid
+
+        # Sign the sessionId with the merchant API key
+        sign = sign_payin_session(payin_uuid, merchant.api_key)
+
         # Generate payment URL with sessionId and sign
-        frontend_base_url = os.getenv('FRONTEND_BASE_URL', 'http://localhost:5173')
-        payment_url = f"{frontend_base_url}/payin?sessionId={payin_uuid}&sign={sign}"
+        payment_url = f"{settings.FRONTEND_BASE_URL}/payin?sessionId={payin_uuid}&sign={sign}"
 
         return Response({
             'message': 'Payment link created successfully',
@@ -566,6 +576,13 @@ class PayinPublicCheckStatusView(APIView):
     """
     permission_classes = [AllowAny]
 
+    # Columns needed to build the status response (and calculate_duration)
+    status_fields = (
+        'id', 'payin_uuid', 'merchant_order_id', 'status', 'pay_amount',
+        'confirmed_amount', 'utr', 'user_submitted_utr', 'utr_submitted_at',
+        'code', 'duration', 'created_at', 'updated_at',
+    )
+
     def _get_payment_status(self, request):
         """Common method to check payment status - used by both GET and POST"""
         # Extract API key from header only (not from query params or body)
@@ -577,9 +594,8 @@ class PayinPublicCheckStatusView(APIView):
             }, status=status.HTTP_401_UNAUTHORIZED)
 
         # Validate API key and get merchant
-        try:
-            merchant = Merchant.objects.get(api_key=api_key, deleted_at=None)
-        except Merchant.DoesNotExist:
+        merchant = Merchant.get_by_api_key(api_key)
+        if merchant is None:
             return Response({
                 'error': 'Invalid API key'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -594,23 +610,18 @@ class PayinPublicCheckStatusView(APIView):
                 'error': 'At least one of payin_uuid or merchant_order_id is required.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Find the payin
-        try:
-            if payin_uuid:
-                payin = Payin.objects.get(payin_uuid=payin_uuid, merchant=merchant, deleted_at=None)
-            else:
-                payin = Payin.objects.get(merchant_order_id=merchant_order_id, merchant=merchant, deleted_at=None)
-        except Payin.DoesNotExist:
+        # Find the payin (most recent one if several match)
+        payins = Payin.objects.only(*self.status_fields).filter(merchant=merchant, deleted_at=None)
+        if payin_uuid:
+            payins = payins.filter(payin_uuid=payin_uuid)
+        else:
+            payins = payins.filter(merchant_order_id=merchant_order_id)
+        payin = payins.order_by('-created_at').first()
+
+        if not payin:
             return Response({
                 'error': 'Payment not found'
             }, status=status.HTTP_404_NOT_FOUND)
-        except Payin.MultipleObjectsReturned:
-            # If multiple payins found with same merchant_order_id, get the most recent
-            payin = Payin.objects.filter(
-                merchant_order_id=merchant_order_id, 
-                merchant=merchant,
-                deleted_at=None
-            ).order_by('-created_at').first()
 
         # Calculate duration if status is success
         if payin.status == 'success':
@@ -658,12 +669,23 @@ class PayinPublicSessionView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            payin = Payin.objects.get(payin_uuid=session_id)
+            payin = Payin.objects.select_related('merchant').prefetch_related(
+                Prefetch(
+                    'merchant__bank_accounts',
+                    queryset=BankAccount.objects.filter(status=True, deleted_at=None),
+                    to_attr='enabled_bank_accounts'
+                )
+            ).get(payin_uuid=session_id)
         except Payin.DoesNotExist:
             return Response({
                 'error': 'Payment session not found'
             }, status=status.HTTP_404_NOT_FOUND)
 
+        if not verify_payin_session_sign(payin.payin_uuid, payin.merchant.api_key, sign):
+            return Response({
+                'error': 'Invalid payment link signature'
+            }, status=status.HTTP_403_FORBIDDEN)
+
         # Check if payment link has expired (10 minutes from creation)
         if payin.created_at:
             expiry_time = payin.created_at + timedelta(minutes=10)
@@ -674,29 +696,45 @@ class PayinPublicSessionView(APIView):
                     'expired': True
                 }, status=status.HTTP_410_GONE)
 
-        # Update status from 'initiated' to 'assigned' when payment link is opened
+        # Update status from 'initiated' to 'assigned' when payment link is opened.
+        # Conditional UPDATE instead of save(): no re-read of the row, and a status
+        # the bot set in the meantime is left alone.
         if payin.status == 'initiated':
-            payin.status = 'assigned'
-            payin.assigned_at = timezone.now()
-            payin.save(update_fields=['status', 'assigned_at'])
+            now = timezone.now()
+            updated = Payin.objects.filter(pk=payin.pk, status='initiated').update(
+                status='assigned',
+                assigned_at=now,
+                updated_at=now,
+            )
+            if updated:
+                payin.status = 'assigned'
+                payin.assigned_at = now
+                payin.updated_at = now
+                # update() bypasses Payin.save(), so send the status-change callback here
+                try:
+                    send_merchant_callback(payin)
+                except Exception as e:
+                    logger.error(f"Payin {payin.id}: Error sending callback after assignment: {str(e)}", exc_info=True)
+            else:
+                payin.refresh_from_db(fields=['status'])
 
-        # Get the associated bank account
+        # Get the associated bank account from the prefetched enabled accounts
+        enabled_bank_accounts = payin.merchant.enabled_bank_accounts
         bank_account = None
 
         # First, try to find bank account by nickname or account holder name if payin.bank is set
         if payin.bank:
-            bank_account = payin.merchant.bank_accounts.filter(
-                Q(nickname=payin.bank) | Q(account_holder_name=payin.bank),
-                status=True,
-                deleted_at=None
-            ).first()
+            bank_account = next(
+                (
+                    account for account in enabled_bank_accounts
+                    if payin.bank in (account.nickname, account.account_holder_name)
+                ),
+                None
+            )
 
         # If not found or payin.bank is not set, fallback to any enabled bank account
-        if not bank_account:
-            bank_account = payin.merchant.bank_accounts.filter(
-                status=True,
-                deleted_at=None
-            ).first()
+        if not bank_account and enabled_bank_accounts:
+            bank_account = enabled_bank_accounts[0]
 
         # If still no bank account found, return an error
         if not bank_account:
@@ -753,7 +791,7 @@ class PayinPublicSessionView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            payin = Payin.objects.get(payin_uuid=session_id)
+            payin = Payin.objects.select_related('merchant').get(payin_uuid=session_id)
         except Payin.DoesNotExist:
             return Response({
                 'error': 'Payment session not found'
@@ -818,8 +856,7 @@ class DashboardView(APIView):
         """Get dashboard statistics"""
         # Get user's accessible merchants
         merchant_ids = request.user.get_accessible_merchant_ids()
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_super_admin = request.user.is_superuser or user_role == 'super_admin'
+        is_super_admin = request.user.is_super_admin
 
         # Base queryset - filter by accessible merchants
         if is_super_admin:
@@ -887,34 +924,35 @@ class DashboardView(APIView):
             payins_queryset = payins_queryset.filter(created_at__lte=end_time)
 
         # Calculate metrics
-        # Total deposits (success status)
         success_payins = payins_queryset.filter(status='success')
-        total_deposits = success_payins.aggregate(
-            total=Sum('confirmed_amount', default=Decimal('0.00'))
-        )['total'] or Decimal('0.00')
-
-        # Deposit count
-        deposit_count = success_payins.count()
-
-        # Deposit percentage (calculate commission)
-        total_deposits_with_commission = success_payins.aggregate(
-            total=Sum(F('confirmed_amount') * F('merchant__payin_commission') / 100, output_field=DecimalField())
-        )['total'] or Decimal('0.00')
 
-        # All-time totals for summary
+        # Selected-range totals (deposits, count, commission) and all-time
+        # totals for the summary, from one conditional aggregate
         all_time_success = Payin.objects.filter(status='success')
         if not is_super_admin:
             all_time_success = all_time_success.filter(merchant_id__in=merchant_ids)
         if merchant_codes:
             all_time_success = all_time_success.filter(merchant__code__in=merchant_codes)
 
-        all_time_deposits = all_time_success.aggregate(
-            total=Sum('confirmed_amount', default=Decimal('0.00'))
-        )['total'] or Decimal('0.00')
-
-        all_time_commission = all_time_success.aggregate(
-            total=Sum(F('confirmed_amount') * F('merchant__payin_commission') / 100, output_field=DecimalField())
-        )['total'] or Decimal('0.00')
+        in_range = Q()
+        if start_time:
+            in_range &= Q(created_at__gte=start_time)
+        if end_time:
+            in_range &= Q(created_at__lte=end_time)
+
+        commission_value = F('confirmed_amount') * F('merchant__payin_commission') / 100
+        totals = all_time_success.aggregate(
+            total=Sum('confirmed_amount', filter=in_range, default=Decimal('0.00')),
+            count=Count('id', filter=in_range),
+            commission=Sum(commission_value, filter=in_range, output_field=DecimalField()),
+            all_time_total=Sum('confirmed_amount', default=Decimal('0.00')),
+            all_time_commission=Sum(commission_value, output_field=DecimalField()),
+        )
+        total_deposits = totals['total'] or Decimal('0.00')
+        deposit_count = totals['count']
+        total_deposits_with_commission = totals['commission'] or Decimal('0.00')
+        all_time_deposits = totals['all_time_total'] or Decimal('0.00')
+        all_time_commission = totals['all_time_commission'] or Decimal('0.00')
 
         # Withdrawals (currently not implemented, return 0)
         total_withdrawals = Decimal('0.00')
@@ -922,9 +960,14 @@ class DashboardView(APIView):
         withdrawal_percentage = Decimal('0.00')
 
         # Settlement (deposits - commission)
-        settlement = Settlement.objects.filter(merchant__in=merchant_ids, status='success').aggregate(settlement=Sum('amount'))['settlement']
-        if not settlement:
-            settlement = 0
+        settlement_qs = Settlement.objects.filter(status='success')
+        if not is_super_admin:
+            settlement_qs = settlement_qs.filter(merchant_id__in=merchant_ids)
+        if merchant_codes:
+            settlement_qs = settlement_qs.filter(merchant__code__in=merchant_codes)
+        settlement = settlement_qs.aggregate(
+            settlement=Sum('amount', default=Decimal('0.00'))
+        )['settlement']
         # Net Balance (all-time deposits - settlement - commission)
         # Note: net_balance should use all_time_deposits, not time-filtered total_deposits
         net_balance = (all_time_deposits - settlement) - all_time_commission
@@ -932,6 +975,9 @@ class DashboardView(APIView):
         # Generate chart data based on time range
         chart_data = []
 
+        # Buckets are truncated in local time by the database
+        local_tz = timezone.get_current_timezone()
+
         # Determine whether to show hourly or daily chart data
         show_hourly = False
         if start_time and end_time:
@@ -942,107 +988,85 @@ class DashboardView(APIView):
         if show_hourly:
             # Get hourly deposits
             hourly_deposits = success_payins.annotate(
-                hour=TruncHour('created_at')
+                hour=TruncHour('created_at', tzinfo=local_tz)
             ).values('hour').annotate(
                 amount=Sum('confirmed_amount'),
                 count=Count('id')
             ).order_by('hour')
 
-            # Create a dictionary of actual data by hour
+            # (amount, count) keyed by naive local hour
             data_by_hour = {}
             for item in hourly_deposits:
-                hour_dt = item['hour']
-                if hasattr(hour_dt, 'tzinfo') and hour_dt.tzinfo is not None:
-                    hour_dt = timezone.localtime(hour_dt)
-                    hour_dt = hour_dt.replace(tzinfo=None)
-
-                # Use hour as key (YYYY-MM-DD HH:00:00 format)
-                hour_key = hour_dt.strftime('%Y-%m-%d %H:00:00')
-                data_by_hour[hour_key] = {
-                    'amount': float(item['amount']) if item['amount'] is not None else 0.0,
-                    'count': item['count']
-                }
+                data_by_hour[item['hour'].replace(tzinfo=None)] = (
+                    float(item['amount']) if item['amount'] is not None else 0.0,
+                    item['count']
+                )
 
             # Generate all hours in the range
             start_hour = start_time.replace(minute=0, second=0, microsecond=0)
             end_hour = end_time.replace(minute=0, second=0, microsecond=0)
             
-            start_hour_local = timezone.localtime(start_hour).replace(tzinfo=None)
-            end_hour_local = timezone.localtime(end_hour).replace(tzinfo=None)
+            start_hour_local = start_hour.astimezone(local_tz).replace(tzinfo=None)
+            end_hour_local = end_hour.astimezone(local_tz).replace(tzinfo=None)
 
             current_hour = start_hour_local
             while current_hour <= end_hour_local:
-                hour_str = current_hour.strftime('%Y-%m-%d %H:00:00')
-                hour_display = current_hour.strftime('%Y-%m-%d %H:%M:%S')
+                amount, count = data_by_hour.get(current_hour, (0.0, 0))
                 chart_data.append({
-                    'date': hour_display,
-                    'amount': data_by_hour.get(hour_str, {}).get('amount', 0.0),
-                    'count': data_by_hour.get(hour_str, {}).get('count', 0)
+                    'date': current_hour.strftime('%Y-%m-%d %H:%M:%S'),
+                    'amount': amount,
+                    'count': count
                 })
                 current_hour += timedelta(hours=1)
         else:
             # Show daily data
             daily_deposits = success_payins.annotate(
-                date=TruncDate('created_at')
+                date=TruncDate('created_at', tzinfo=local_tz)
             ).values('date').annotate(
                 amount=Sum('confirmed_amount'),
                 count=Count('id')
             ).order_by('date')
 
-            # Create a dictionary of actual data by date
+            # (amount, count) keyed by date ordinal
             data_by_date = {}
             for item in daily_deposits:
-                date_dt = item['date']
-                if not isinstance(date_dt, date):
-                    if hasattr(date_dt, 'tzinfo') and date_dt.tzinfo is not None:
-                        date_dt = timezone.localtime(date_dt)
-                    date_dt = date_dt.date() if hasattr(date_dt, 'date') else date_dt
-
-                date_str = date_dt.strftime('%Y-%m-%d')
                 amount_value = float(item['amount']) if item['amount'] is not None else 0.0
-                data_by_date[date_str] = {
-                    'amount': amount_value,
-                    'count': item['count']
-                }
+                data_by_date[item['date'].toordinal()] = (amount_value, item['count'])
 
             # Generate all dates in the range
-            start_date_local = timezone.localtime(start_time).date()
-            end_date_local = timezone.localtime(end_time).date()
-
-            current_date = start_date_local
-            while current_date <= end_date_local:
-                date_str = current_date.strftime('%Y-%m-%d')
-                amount = data_by_date.get(date_str, {}).get('amount', 0.0)
-                count = data_by_date.get(date_str, {}).get('count', 0)
+            start_ordinal = start_time.astimezone(local_tz).date().toordinal()
+            end_ordinal = end_time.astimezone(local_tz).date().toordinal()
+
+            for ordinal in range(start_ordinal, end_ordinal + 1):
+                amount, count = data_by_date.get(ordinal, (0.0, 0))
                 chart_data.append({
-                    'date': date_str,
+                    'date': date.fromordinal(ordinal).isoformat(),
                     'amount': amount,
                     'count': count
                 })
-                current_date += timedelta(days=1)
 
         return Response({
             'deposits': {
-                'total': str(total_deposits),
+                'total': format_amount(total_deposits),
                 'count': deposit_count,
-                'percentage': str(total_deposits_with_commission)
+                'percentage': format_amount(total_deposits_with_commission)
             },
             'withdrawals': {
-                'total': str(total_withdrawals),
+                'total': format_amount(total_withdrawals),
                 'count': withdrawal_count,
-                'percentage': str(withdrawal_percentage)
+                'percentage': format_amount(withdrawal_percentage)
             },
             'summary': {
-                'deposits': str(all_time_deposits),
-                'withdrawals': str(total_withdrawals),
-                'commission': str(all_time_commission),
+                'deposits': format_amount(all_time_deposits),
+                'withdrawals': format_amount(total_withdrawals),
+                'commission': format_amount(all_time_commission),
                 'chargeback': '0.00',
                 'payout_balance': '0.00',
-                'settlement': str(settlement),
-                'net_balance': str(net_balance)
+                'settlement': format_amount(settlement),
+                'net_balance': format_amount(net_balance)
             },
             'chart': {
-                'total_amount': str(total_deposits),
+                'total_amount': format_amount(total_deposits),
                 'total_count': deposit_count,
                 'data': chart_data
             }
@@ -1059,49 +1083,38 @@ class QueuedTransactionsView(APIView):
     def get(self, request):
         """Get list of queued (unused) extracted transactions"""
         # Get base queryset - only unused transactions
-        queryset = ExtractedTransactions.objects.filter(is_used=False, deleted_at=None)
+        # Serializer reads bank_account and bank_account.merchant for every row
+        queryset = ExtractedTransactions.objects.select_related(
+            'bank_account', 'bank_account__merchant'
+        ).filter(is_used=False, deleted_at=None)
 
         # Filter by user's accessible merchants (multi-tenant)
         # Get merchant IDs that the user can access
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_super_admin = request.user.is_superuser or user_role == 'super_admin'
+        is_super_admin = request.user.is_super_admin
 
         if not is_super_admin:
-            merchant_ids = request.user.get_accessible_merchant_ids()
-            # Filter by bank accounts that belong to accessible merchants
-            queryset = queryset.filter(bank_account__merchant_id__in=merchant_ids)
+            # Filter by the transaction's own merchant column (no join through bank_account),
+            # as a subquery rather than a separate merchant id lookup
+            accessible_merchants = request.user.merchants.filter(deleted_at=None).values('id')
+            queryset = queryset.filter(merchant_id__in=accessible_merchants)
 
-        # Filter by ID if provided
-        transaction_id = request.query_params.get('id', None)
-        if transaction_id:
-            try:
-                queryset = queryset.filter(id=int(transaction_id))
-            except ValueError:
-                return Response({
-                    'error': 'Invalid ID format'
-                }, status=status.HTTP_400_BAD_REQUEST)
+        # Filter by ID, amount and bank account if provided (non-integer values are rejected)
+        try:
+            int_filters = {
+                field: get_int_param(request.query_params, param)
+                for param, field in (('id', 'id'), ('amount', 'amount'), ('bank_account', 'bank_account_id'))
+            }
+        except ValueError as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(**{field: value for field, value in int_filters.items() if value is not None})
 
         # Filter by UTR if provided
         utr = request.query_params.get('utr', None)
         if utr:
             queryset = queryset.filter(utr__icontains=utr)
 
-        # Filter by amount if provided
-        amount = request.query_params.get('amount', None)
-        if amount:
-            try:
-                queryset = queryset.filter(amount=int(amount))
-            except ValueError:
-                pass
-
-        # Filter by bank account if provided
-        bank_account_id = request.query_params.get('bank_account', None)
-        if bank_account_id:
-            try:
-                queryset = queryset.filter(bank_account_id=int(bank_account_id))
-            except ValueError:
-                pass
-
         # Filter by bank nickname, account holder name, or merchant name if provided
         bank_filter = request.query_params.get('bank', None)
         if bank_filter:
@@ -1124,31 +1137,11 @@ class QueuedTransactionsView(APIView):
         # Order by created_at descending (newest first)
         queryset = queryset.order_by('-created_at')
 
-        # Get total count before pagination
-        total_count = queryset.count()
-
         # Pagination
-        page = request.query_params.get('page', 1)
-        page_size = request.query_params.get('page_size', 20)
-        try:
-            page = int(page)
-            page_size = int(page_size)
-            if page < 1:
-                page = 1
-            if page_size < 1:
-                page_size = 20
-            if page_size > 100:
-                page_size = 100
-        except ValueError:
-            page = 1
-            page_size = 20
-
-        # Calculate pagination offsets
-        start_index = (page - 1) * page_size
-        end_index = start_index + page_size
-        queryset = queryset[start_index:end_index]
-
-        serializer = ExtractedTransactionSerializer(queryset, many=True)
+        page, page_size = get_page_params(request.query_params)
+        results, total_count = paginate(queryset, page, page_size)
+
+        serializer = ExtractedTransactionSerializer(results, many=True)
 
         # Calculate total pages
         total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
@@ -1170,8 +1163,7 @@ class QueuedTransactionMarkUsedView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_super_admin = request.user.is_superuser or user_role == 'super_admin'
+        is_super_admin = request.user.is_super_admin
 
         try:
             transaction_obj = ExtractedTransactions.objects.get(id=pk, deleted_at=None)
@@ -1182,7 +1174,8 @@ class QueuedTransactionMarkUsedView(APIView):
 
         if not is_super_admin:
             merchant_ids = request.user.get_accessible_merchant_ids()
-            if transaction_obj.bank_account.merchant_id not in merchant_ids:
+            # Same column the queued list filters on
+            if transaction_obj.merchant_id not in merchant_ids:
                 return Response({
                     'error': 'Permission denied'
                 }, status=status.HTTP_403_FORBIDDEN)
@@ -1220,8 +1213,7 @@ class PayinReportExportView(APIView):
         end_date = request.query_params.get('end_date')
 
         # Get user's accessible merchants
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_super_admin = request.user.is_superuser or user_role == 'super_admin'
+        is_super_admin = request.user.is_super_admin
 
         # Build queryset
         if is_super_admin:
@@ -1229,6 +1221,7 @@ class PayinReportExportView(APIView):
         else:
             merchant_ids = request.user.get_accessible_merchant_ids()
             queryset = Payin.objects.filter(deleted_at=None, merchant_id__in=merchant_ids)
+        queryset = queryset.select_related('merchant')
 
         # Apply filters
         if merchant_id:
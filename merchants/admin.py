@@ -45,10 +45,12 @@ class MerchantAdmin(admin.ModelAdmin):
     def get_payin_range_display(self, obj):
         return obj.get_payin_range()
     get_payin_range_display.short_description = 'Payin Range'
+    get_payin_range_display.admin_order_field = 'payin_min'
     
     def get_payout_range_display(self, obj):
         return obj.get_payout_range()
     get_payout_range_display.short_description = 'Payout Range'
+    get_payout_range_display.admin_order_field = 'payout_min'
 
 @admin.register(BankAccount)
 class BankAccountAdmin(admin.ModelAdmin):
@@ -68,6 +70,8 @@ class BankAccountAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['bank_type', 'is_enabled', 'is_approved', 'is_qr', 'is_bank', 'status', 'login_type', 'merchant', 'created_at']
+    list_select_related = ['merchant']
+    autocomplete_fields = ['merchant']
     search_fields = ['nickname', 'account_holder_name', 'account_number', 'ifsc_code', 'upi_id']
     readonly_fields = ['created_at', 'updated_at', 'deleted_at', 'balance', 'transaction_count']
     fieldsets = (
@@ -99,6 +103,7 @@ class BankAccountAdmin(admin.ModelAdmin):
     def get_payin_range_display(self, obj):
         return obj.get_payin_range()
     get_payin_range_display.short_description = 'Payin Range'
+    get_payin_range_display.admin_order_field = 'min_payin'
 
 
 @admin.register(ExtractedTransactions)
@@ -113,6 +118,8 @@ class ExtractedTransactionsAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['is_used', 'bank_account', 'created_at']
+    list_select_related = ['bank_account']
+    raw_id_fields = ['bank_account']
     search_fields = ['utr', 'bank_account__nickname', 'bank_account__account_number']
     readonly_fields = ['created_at', 'used_at']
     fieldsets = (
@@ -125,3 +132,9 @@ class ExtractedTransactionsAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        # merchant isn't on the form; keep it in step with the chosen bank account
+        if not change or 'bank_account' in form.changed_data:
+            obj.merchant_id = obj.bank_account.merchant_id
+        super().save_model(request, obj, form, change)
+
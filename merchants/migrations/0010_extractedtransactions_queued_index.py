@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merchants', '0009_extractedtransactions_used_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='extractedtransactions',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_used', False)), fields=['-created_at'], name='et_queued_created_idx'),
+        ),
+    ]
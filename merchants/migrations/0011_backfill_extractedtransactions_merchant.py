@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_merchant(apps, schema_editor):
+    """Copy merchant_id from each transaction's bank account (0006 defaulted existing rows to 1)"""
+    ExtractedTransactions = apps.get_model('merchants', 'ExtractedTransactions')
+    BankAccount = apps.get_model('merchants', 'BankAccount')
+    ExtractedTransactions.objects.update(
+        merchant_id=Subquery(
+            BankAccount.objects.filter(pk=OuterRef('bank_account_id')).values('merchant_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merchants', '0010_extractedtransactions_queued_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_merchant, migrations.RunPython.noop),
+    ]
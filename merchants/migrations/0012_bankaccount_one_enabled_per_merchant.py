@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:44
+
+from django.db import migrations, models
+
+
+def disable_extra_enabled_accounts(apps, schema_editor):
+    """Keep only the most recently updated enabled account per merchant before adding the constraint"""
+    BankAccount = apps.get_model('merchants', 'BankAccount')
+    enabled = BankAccount.objects.filter(is_enabled=True, deleted_at=None).order_by('merchant_id', '-updated_at', '-id')
+    seen_merchants = set()
+    extra_ids = []
+    for account_id, merchant_id in enabled.values_list('id', 'merchant_id'):
+        if merchant_id in seen_merchants:
+            extra_ids.append(account_id)
+        else:
+            seen_merchants.add(merchant_id)
+    if extra_ids:
+        BankAccount.objects.filter(id__in=extra_ids).update(is_enabled=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merchants', '0011_backfill_extractedtransactions_merchant'),
+    ]
+
+    operations = [
+        migrations.RunPython(disable_extra_enabled_accounts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='bankaccount',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted_at__isnull', True), ('is_enabled', True)), fields=('merchant',), name='one_enabled_ba_per_merchant'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merchants', '0012_bankaccount_one_enabled_per_merchant'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='extractedtransactions',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='extractedtransactions',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_used', False)), fields=['bank_account', '-created_at'], name='et_queued_bank_created_idx'),
+        ),
+    ]
@@ -1,11 +1,16 @@
-import os
-from django.db import models
+import hashlib
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 import secrets
 from core.models.base import SoftDeleteModel
 
 
+ZERO = Decimal('0.00')
+HUNDRED = Decimal('100.00')
+
 # Bank type choices for the bot system
 BANK_TYPE_CHOICES = [
     ('iob', 'Indian Overseas Bank (IOB)'),
@@ -53,15 +58,15 @@ class BankAccount(SoftDeleteModel):
     min_payin = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Minimum payin amount"
     )
     max_payin = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Maximum payin amount"
     )
     
@@ -69,7 +74,7 @@ class BankAccount(SoftDeleteModel):
     balance = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
+        default=ZERO,
         help_text="Current account balance"
     )
     transaction_count = models.IntegerField(
@@ -153,6 +158,16 @@ class BankAccount(SoftDeleteModel):
         verbose_name = 'Bank Account'
         verbose_name_plural = 'Bank Accounts'
         ordering = ['-created_at']
+        constraints = [
+            # At most one enabled account per merchant; its index also serves the
+            # is_enabled lookups in save() and the bank account / payin create
+            # serializers (the payment session page filters on status instead)
+            models.UniqueConstraint(
+                fields=['merchant'],
+                condition=models.Q(is_enabled=True, deleted_at__isnull=True),
+                name='one_enabled_ba_per_merchant',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.nickname} - {self.account_holder_name}"
@@ -167,23 +182,39 @@ class BankAccount(SoftDeleteModel):
     
     def save(self, *args, **kwargs):
         """Override save to ensure only one bank account per merchant is enabled at a time"""
-        # If this account is being enabled, disable all other accounts for the same merchant
-        if self.is_enabled and self.merchant_id:
-            # Get all other bank accounts for this merchant (excluding self if updating)
-            other_accounts = BankAccount.objects.filter(
-                merchant_id=self.merchant_id,
-                is_enabled=True,
-                deleted_at=None
-            )
-            # Exclude self if this is an update (pk exists)
-            if self.pk:
-                other_accounts = other_accounts.exclude(pk=self.pk)
-            
-            # Disable all other enabled accounts for this merchant
-            if other_accounts.exists():
+        with transaction.atomic():
+            # If this account is being enabled, disable all other accounts for the same merchant
+            if self.is_enabled and self.merchant_id:
+                # Get all other bank accounts for this merchant (excluding self if updating)
+                other_accounts = BankAccount.objects.filter(
+                    merchant_id=self.merchant_id,
+                    is_enabled=True,
+                    deleted_at=None
+                )
+                # Exclude self if this is an update (pk exists)
+                if self.pk:
+                    other_accounts = other_accounts.exclude(pk=self.pk)
+
+                # Disable all other enabled accounts for this merchant (no-op if none)
                 other_accounts.update(is_enabled=False)
-        
-        super().save(*args, **kwargs)
+
+            super().save(*args, **kwargs)
+
+            # Extracted transactions keep their own copy of merchant_id (the queued
+            # list filters on it), so carry it over when the account changes merchant
+            loaded_merchant_id = getattr(self, '_loaded_merchant_id', None)
+            if loaded_merchant_id is not None and loaded_merchant_id != self.merchant_id:
+                ExtractedTransactions.all_objects.filter(bank_account_id=self.pk).update(
+                    merchant_id=self.merchant_id
+                )
+        self._loaded_merchant_id = self.merchant_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored merchant so save() can tell when the account is moved
+        instance._loaded_merchant_id = instance.__dict__.get('merchant_id')
+        return instance
 
 
 class Merchant(SoftDeleteModel):
@@ -198,7 +229,7 @@ class Merchant(SoftDeleteModel):
     balance = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
+        default=ZERO,
         help_text="Current balance"
     )
     
@@ -206,22 +237,22 @@ class Merchant(SoftDeleteModel):
     payin_min = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Minimum payin amount"
     )
     payin_max = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Maximum payin amount"
     )
     payin_commission = models.DecimalField(
         max_digits=5,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00')), MaxValueValidator(Decimal('100.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO), MaxValueValidator(HUNDRED)],
         help_text="Payin commission percentage"
     )
     
@@ -229,22 +260,22 @@ class Merchant(SoftDeleteModel):
     payout_min = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Minimum payout amount"
     )
     payout_max = models.DecimalField(
         max_digits=15,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO)],
         help_text="Maximum payout amount"
     )
     payout_commission = models.DecimalField(
         max_digits=5,
         decimal_places=2,
-        default=Decimal('0.00'),
-        validators=[MinValueValidator(Decimal('0.00')), MaxValueValidator(Decimal('100.00'))],
+        default=ZERO,
+        validators=[MinValueValidator(ZERO), MaxValueValidator(HUNDRED)],
         help_text="Payout commission percentage"
     )
     
@@ -271,17 +302,62 @@ class Merchant(SoftDeleteModel):
     def save(self, *args, **kwargs):
         """Override save to auto-generate API key if not provided"""
         if not self.pk and not self.api_key:
-            # Only generate API key for new merchants (when pk is None)
-            # Generate a secure random API key
-            self.api_key = secrets.token_urlsafe(32)
-            # Ensure uniqueness
-            while Merchant.objects.filter(api_key=self.api_key).exists():
+            # Only generate API key for new merchants (when pk is None).
+            # Uniqueness is left to the unique constraint; a collision only
+            # costs a retry instead of a lookup before every insert.
+            for attempt in range(3):
                 self.api_key = secrets.token_urlsafe(32)
-        super().save(*args, **kwargs)
+                try:
+                    with transaction.atomic():
+                        super().save(*args, **kwargs)
+                    break
+                except IntegrityError:
+                    # Re-raise failures that aren't an api_key collision (e.g. duplicate code)
+                    if attempt == 2 or not Merchant.objects.filter(api_key=self.api_key).exists():
+                        raise
+        else:
+            super().save(*args, **kwargs)
+
+        # Evict the current key and, if the key was changed, the one it replaced
+        api_keys = {self.api_key, getattr(self, '_loaded_api_key', None)} - {None, ''}
+        cache.delete_many([self._api_key_cache_key(api_key) for api_key in api_keys])
+        self._loaded_api_key = self.api_key
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored API key so save() can evict it if the key is changed
+        instance._loaded_api_key = instance.__dict__.get('api_key')
+        return instance
+
+    # Seconds a merchant stays cached by API key (bounds staleness across workers)
+    API_KEY_CACHE_TIMEOUT = 60
+
+    @staticmethod
+    def _api_key_cache_key(api_key):
+        return f"merchant_api_key:{hashlib.sha256(api_key.encode()).hexdigest()}"
+
+    @classmethod
+    def get_by_api_key(cls, api_key):
+        """
+        Returns the active merchant for an API key, or None. Cached briefly since keys rarely change.
+
+        save() evicts the entry, but queryset .update() calls do not, so other fields on
+        the cached instance can be up to API_KEY_CACHE_TIMEOUT seconds stale. The public
+        payin endpoints only read its id and api_key, so that is acceptable for them;
+        callers needing current merchant settings should query the row instead.
+        """
+        cache_key = cls._api_key_cache_key(api_key)
+        merchant = cache.get(cache_key)
+        if merchant is None:
+            merchant = cls.objects.filter(api_key=api_key, deleted_at=None).first()
+            if merchant is not None:
+                cache.set(cache_key, merchant, cls.API_KEY_CACHE_TIMEOUT)
+        return merchant
 
     def get_payment_url(self, user_id):
         """Returns the payment URL for the merchant"""
-        return f"{os.getenv('FRONTEND_BASE_URL')}/pay/{self.code}/{user_id}"
+        return f"{settings.FRONTEND_BASE_URL}/pay/{self.code}/{user_id}"
 
 
 class ExtractedTransactions(SoftDeleteModel):
@@ -290,7 +366,6 @@ class ExtractedTransactions(SoftDeleteModel):
     merchant = models.ForeignKey('Merchant', on_delete=models.CASCADE, related_name='extracted_transactions')
     amount = models.PositiveIntegerField(help_text="Amount of the transaction")
     utr = models.CharField(max_length=255, help_text="UTR of the transaction", db_index=True)
-    created_at = models.DateTimeField(auto_now_add=True, help_text="Creation time")
     is_used = models.BooleanField(default=False, help_text="Whether the transaction has been used", db_index=True)
     used_at = models.DateTimeField(null=True, blank=True, help_text="Time when the transaction was used")
 
@@ -303,6 +378,18 @@ class ExtractedTransactions(SoftDeleteModel):
             models.Index(fields=['utr', 'is_used']),
             models.Index(fields=['bank_account', 'utr']),
             models.Index(fields=['merchant', 'utr']),
+            # Queued transactions listing: unused rows, newest first
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_used=False, deleted_at__isnull=True),
+                name='et_queued_created_idx',
+            ),
+            # Same listing filtered to one bank account
+            models.Index(
+                fields=['bank_account', '-created_at'],
+                condition=models.Q(is_used=False, deleted_at__isnull=True),
+                name='et_queued_bank_created_idx',
+            ),
         ]
 
     def __str__(self):
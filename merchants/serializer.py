@@ -1,10 +1,24 @@
+import copy
+from django.db import IntegrityError
 from rest_framework import serializers
 from .models import Merchant, BankAccount
 
 
-class MerchantSerializer(serializers.ModelSerializer):
-    payin_range = serializers.SerializerMethodField()
-    payout_range = serializers.SerializerMethodField()
+class CachedFieldsMixin:
+    """Build the ModelSerializer field map once per class and hand out copies"""
+
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get('_cached_fields')
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return copy.deepcopy(fields)
+
+
+class MerchantSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    payin_range = serializers.CharField(source='get_payin_range', read_only=True)
+    payout_range = serializers.CharField(source='get_payout_range', read_only=True)
     
     class Meta:
         model = Merchant
@@ -31,14 +45,6 @@ class MerchantSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'balance']
     
-    def get_payin_range(self, obj):
-        """Returns formatted payin range"""
-        return obj.get_payin_range()
-    
-    def get_payout_range(self, obj):
-        """Returns formatted payout range"""
-        return obj.get_payout_range()
-    
     def validate(self, attrs):
         """Validate that min values are less than max values"""
         if 'payin_min' in attrs and 'payin_max' in attrs:
@@ -93,10 +99,10 @@ class MerchantCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class BankAccountSerializer(serializers.ModelSerializer):
+class BankAccountSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for BankAccount model"""
-    payin_range = serializers.SerializerMethodField()
-    balance_display = serializers.SerializerMethodField()
+    payin_range = serializers.CharField(source='get_payin_range', read_only=True)
+    balance_display = serializers.CharField(source='get_balance_display', read_only=True)
     merchant_name = serializers.CharField(source='merchant.name', read_only=True)
     merchant_code = serializers.CharField(source='merchant.code', read_only=True)
     bank_type_display = serializers.CharField(source='get_bank_type_display', read_only=True)
@@ -137,18 +143,18 @@ class BankAccountSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'balance', 'transaction_count']
-    
-    def get_payin_range(self, obj):
-        """Returns formatted payin range"""
-        return obj.get_payin_range()
-    
-    def get_balance_display(self, obj):
-        """Returns formatted balance with transaction count"""
-        return obj.get_balance_display()
 
 
 class BankAccountCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating bank accounts"""
+    ONE_ENABLED_ERROR = 'Only one bank account per merchant can be enabled at a time. Please disable the currently enabled account first.'
+    # How a violation of one_enabled_ba_per_merchant shows up in the IntegrityError
+    # message (PostgreSQL names the constraint, SQLite names its column)
+    ONE_ENABLED_VIOLATION_MARKERS = (
+        'one_enabled_ba_per_merchant',
+        'UNIQUE constraint failed: bank_accounts.merchant_id',
+    )
+
     class Meta:
         model = BankAccount
         fields = [
@@ -198,8 +204,18 @@ class BankAccountCreateSerializer(serializers.ModelSerializer):
             
             if other_enabled.exists():
                 raise serializers.ValidationError({
-                    'is_enabled': 'Only one bank account per merchant can be enabled at a time. Please disable the currently enabled account first.'
+                    'is_enabled': self.ONE_ENABLED_ERROR
                 })
         
         return attrs
 
+    def save(self, **kwargs):
+        # A concurrent enable can still slip past validate(); the partial
+        # unique constraint catches it
+        try:
+            return super().save(**kwargs)
+        except IntegrityError as e:
+            if not any(marker in str(e) for marker in self.ONE_ENABLED_VIOLATION_MARKERS):
+                raise
+            raise serializers.ValidationError({'is_enabled': self.ONE_ENABLED_ERROR})
+
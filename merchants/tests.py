@@ -1,3 +1,41 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import CustomUser
+from .models import Merchant, BankAccount
+
+
+class ListQueryCountTests(TestCase):
+    """Query counts of the list endpoints must not grow with the number of rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_user('admin', 'pw', full_name='Admin', role='admin')
+        for i in range(3):
+            merchant = Merchant.objects.create(name=f'Merchant {i}', code=f'M{i}', site='http://example.com')
+            BankAccount.objects.create(
+                merchant=merchant,
+                nickname=f'Account {i}',
+                account_holder_name='Holder',
+                account_number=str(i),
+                ifsc_code='IFSC0000001',
+            )
+            cls.admin.merchants.add(merchant)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_merchant_list_query_count(self):
+        # Accessible merchant ids, then the merchant rows
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/merchants/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_bank_account_list_query_count(self):
+        # Accessible merchant ids, then the bank accounts joined with their merchant
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/merchants/bank-accounts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
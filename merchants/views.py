@@ -1,8 +1,14 @@
+import logging
+import uuid
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.db.models import Q
 from .models import Merchant, BankAccount
 from core.utils.multi_tenant import filter_by_user_merchants
@@ -13,13 +19,33 @@ from .serializer import (
 
     BankAccountCreateSerializer
 )
-from deposit.task import run_single_bot
+from deposit.task import run_single_bot, BOT_LOCK_TIMEOUT
 from payiq.celery import app
 from django.conf import settings
-import redis
+from core.utils.redis_client import redis_client, ACTIVE_BOT_LOCKS_KEY, ACTIVE_BOT_STOP_FLAGS_KEY
 
-# Connect to Redis
-redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+logger = logging.getLogger(__name__)
+
+# Worker check result is reused briefly so starting several bots doesn't broadcast each time
+WORKER_COUNT_CACHE_KEY = 'celery_active_worker_count'
+WORKER_COUNT_CACHE_SECONDS = 5
+
+
+def _get_active_worker_count():
+    """
+    Returns the number of Celery workers answering inspect().active(),
+    or None if the check timed out (timeouts are not cached)
+    """
+    cached = redis_client.get(WORKER_COUNT_CACHE_KEY)
+    if cached is not None:
+        return int(cached)
+
+    active_workers = app.control.inspect(timeout=2.0).active()
+    if active_workers is None:
+        return None
+
+    redis_client.set(WORKER_COUNT_CACHE_KEY, len(active_workers), ex=WORKER_COUNT_CACHE_SECONDS)
+    return len(active_workers)
 
 
 class MerchantListView(APIView):
@@ -34,20 +60,17 @@ class MerchantListView(APIView):
         """Get list of all merchants (excluding soft-deleted)"""
         merchants = Merchant.objects.filter(deleted_at=None)
         # Filter by user's accessible merchants (multi-tenant)
-        merchant_ids = request.user.get_accessible_merchant_ids()
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role == 'super_admin'):
-            merchants = merchants.filter(id__in=merchant_ids)
+        if not request.user.is_super_admin:
+            merchants = merchants.filter(id__in=request.user.get_accessible_merchant_ids())
         serializer = MerchantSerializer(merchants, many=True)
         return Response({
-            'count': merchants.count(),
+            'count': len(serializer.data),
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
     def post(self, request):
         """Create a new merchant - Only super_admin can create merchants"""
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role == 'super_admin'):
+        if not request.user.is_super_admin:
             return Response({
                 'error': 'Only super_admin can create merchants'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -115,7 +138,10 @@ class BankAccountListView(APIView):
 
     def get(self, request):
         """Get list of all bank accounts (excluding soft-deleted) with optional filters"""
-        queryset = BankAccount.objects.filter(deleted_at=None)
+        # Only merchant name/code are serialized; skip its wide URL and key columns
+        queryset = BankAccount.objects.filter(deleted_at=None).select_related('merchant').defer(
+            'merchant__site', 'merchant__return_url', 'merchant__callback_url', 'merchant__api_key'
+        )
 
         # Filter by user's accessible merchants (multi-tenant)
         queryset = filter_by_user_merchants(queryset, request.user, 'merchant')
@@ -131,14 +157,13 @@ class BankAccountListView(APIView):
 
         serializer = BankAccountSerializer(queryset, many=True)
         return Response({
-            'count': queryset.count(),
+            'count': len(serializer.data),
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
     def post(self, request):
         """Create a new bank account - Only super_admin can create bank accounts"""
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role == 'super_admin' or user_role == 'admin'):
+        if not request.user.is_admin_or_super_admin:
             return Response({
                 'error': 'Only super_admin can create bank accounts'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -163,13 +188,13 @@ class BankAccountDetailView(APIView):
 
     def get(self, request, pk):
         """Get a specific bank account by ID"""
-        bank_account = get_object_or_404(BankAccount, pk=pk)
+        bank_account = get_object_or_404(BankAccount.objects.select_related('merchant'), pk=pk)
         serializer = BankAccountSerializer(bank_account)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         """Full update of a bank account"""
-        bank_account = get_object_or_404(BankAccount, pk=pk)
+        bank_account = get_object_or_404(BankAccount.objects.select_related('merchant'), pk=pk)
         serializer = BankAccountCreateSerializer(bank_account, data=request.data)
         serializer.is_valid(raise_exception=True)
         updated_bank_account = serializer.save()
@@ -179,7 +204,7 @@ class BankAccountDetailView(APIView):
 
     def patch(self, request, pk):
         """Partial update of a bank account"""
-        bank_account = get_object_or_404(BankAccount, pk=pk)
+        bank_account = get_object_or_404(BankAccount.objects.select_related('merchant'), pk=pk)
         serializer = BankAccountCreateSerializer(bank_account, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         updated_bank_account = serializer.save()
@@ -189,8 +214,10 @@ class BankAccountDetailView(APIView):
 
     def delete(self, request, pk):
         """Soft delete a bank account"""
-        bank_account = get_object_or_404(BankAccount, pk=pk)
-        bank_account.soft_delete()
+        # Single UPDATE instead of load + save(); save() has no side effects for a soft delete
+        now = timezone.now()
+        if not BankAccount.objects.filter(pk=pk).update(deleted_at=now, updated_at=now):
+            raise Http404
         return Response({
             'message': 'Bank account deleted successfully'
         }, status=status.HTTP_200_OK)
@@ -205,22 +232,22 @@ class BankAccountStatusUpdateView(APIView):
 
     def _stop_bot_for_account(self, pk, bank_account):
         """Stop bot for a specific bank account and send notification."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         lock_key = f'celery_task_run_bot_lock_{pk}'
         stop_flag_key = f'bot_stop_flag_{pk}'
         task_id = redis_client.get(lock_key)
 
         if task_id:
             # Set stop flag
-            redis_client.set(stop_flag_key, '1', ex=300)
+            (
+                redis_client.pipeline()
+                .set(stop_flag_key, '1', ex=300)
+                .sadd(ACTIVE_BOT_STOP_FLAGS_KEY, stop_flag_key)
+                .execute()
+            )
             logger.info(f"Auto-stopping bot for bank account {pk} due to account disable")
 
             # Send WebSocket notification
             try:
-                from channels.layers import get_channel_layer
-                from asgiref.sync import async_to_sync
                 channel_layer = get_channel_layer()
                 async_to_sync(channel_layer.group_send)(
                     "task_status_updates",
@@ -240,8 +267,7 @@ class BankAccountStatusUpdateView(APIView):
         bank_account = get_object_or_404(BankAccount, pk=pk)
 
         # Check if user is super_admin for is_approved field
-        user_role = request.user.role.lower() if request.user.role else ''
-        is_super_admin = request.user.is_superuser or user_role == 'super_admin'
+        is_super_admin = request.user.is_super_admin
 
         # Allowed status fields - is_approved only for super_admin
         allowed_fields = ['is_enabled', 'is_qr', 'is_bank', 'status']
@@ -282,21 +308,29 @@ class StartBotView(APIView):
     def post(self, request, pk):
         bank_account = get_object_or_404(BankAccount, pk=pk)
 
-        # Check if already running
+        # Take the bot lock under the id the task will run with, so two
+        # concurrent starts can't both queue a bot (the task accepts a lock holding its own id)
         lock_key = f'celery_task_run_bot_lock_{pk}'
-        if redis_client.get(lock_key):
-             return Response({
+        task_id = str(uuid.uuid4())
+        lock_acquired, _ = (
+            redis_client.pipeline()
+            .set(lock_key, task_id, nx=True, ex=BOT_LOCK_TIMEOUT)
+            .sadd(ACTIVE_BOT_LOCKS_KEY, lock_key)
+            .execute()
+        )
+        if not lock_acquired:
+            return Response({
                 'message': 'Bot is already running for this account'
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # Check if Celery workers are running
         try:
-            inspect = app.control.inspect(timeout=2.0)
-            active_workers = inspect.active()
-            # If inspect.active() returns None, it means the check timed out (workers are busy or unresponsive).
+            worker_count = _get_active_worker_count()
+            # None means the check timed out (workers are busy or unresponsive).
             # We do NOT block the user in case of timeouts/errors; we only block if we successfully contact
-            # the broker and it returns an empty dict (which indicates 0 workers are registered).
-            if active_workers is not None and not active_workers:
+            # the broker and it reports 0 workers registered.
+            if worker_count == 0:
+                redis_client.delete(lock_key)
                 return Response({
                     'message': 'Celery workers are not running. Please start Celery workers to execute bot tasks.',
                     'error': 'WORKERS_NOT_RUNNING',
@@ -305,37 +339,37 @@ class StartBotView(APIView):
         except Exception as e:
             # If inspection fails, still try to queue the task
             # but warn the user
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Could not inspect Celery workers: {str(e)}")
 
+        interval = getattr(settings, 'BOT_EXECUTION_INTERVAL', 60)
+
         # Send initial status update
         try:
-            from channels.layers import get_channel_layer
-            from asgiref.sync import async_to_sync
             channel_layer = get_channel_layer()
             async_to_sync(channel_layer.group_send)(
                 "task_status_updates",
                 {
                     "type": "task_update",
                     "status": "starting",
-                    "message": f"Bot starting in continuous mode (interval: {getattr(settings, 'BOT_EXECUTION_INTERVAL', 60)}s)",
+                    "message": f"Bot starting in continuous mode (interval: {interval}s)",
                     "bank_account_id": pk,
                     "merchant_id": bank_account.merchant_id,
                 }
             )
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Could not send WebSocket status update: {str(e)}")
 
         # Trigger task
-        task = run_single_bot.delay(pk)
+        try:
+            task = run_single_bot.apply_async(args=[pk], task_id=task_id)
+        except Exception:
+            redis_client.delete(lock_key)
+            raise
 
         return Response({
-            'message': f'Bot started successfully in continuous mode (interval: {getattr(settings, "BOT_EXECUTION_INTERVAL", 60)}s)',
+            'message': f'Bot started successfully in continuous mode (interval: {interval}s)',
             'task_id': task.id,
-            'interval': getattr(settings, 'BOT_EXECUTION_INTERVAL', 60)
+            'interval': interval
         }, status=status.HTTP_200_OK)
 
 
@@ -362,13 +396,16 @@ class StopBotView(APIView):
                 'message': 'Bot is not running for this account'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Set stop flag to signal the continuous loop to stop
-        redis_client.set(stop_flag_key, '1', ex=300)  # Expires in 5 minutes as safety
+        # Set stop flag to signal the continuous loop to stop (expires in 5 minutes as safety)
+        (
+            redis_client.pipeline()
+            .set(stop_flag_key, '1', ex=300)
+            .sadd(ACTIVE_BOT_STOP_FLAGS_KEY, stop_flag_key)
+            .execute()
+        )
 
         # Send status update via WebSocket
         try:
-            from channels.layers import get_channel_layer
-            from asgiref.sync import async_to_sync
             channel_layer = get_channel_layer()
             status_message = "Force stopping bot..." if force else "Bot stop signal sent, stopping after current iteration..."
             async_to_sync(channel_layer.group_send)(
@@ -382,8 +419,6 @@ class StopBotView(APIView):
                 }
             )
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"Could not send WebSocket status update: {str(e)}")
 
         if force:
@@ -396,8 +431,6 @@ class StopBotView(APIView):
 
                 # Send stopped status
                 try:
-                    from channels.layers import get_channel_layer
-                    from asgiref.sync import async_to_sync
                     channel_layer = get_channel_layer()
                     async_to_sync(channel_layer.group_send)(
                         "task_status_updates",
@@ -473,14 +506,19 @@ class BotStatusView(APIView):
 
             statuses = {}
 
-            for account in queryset:
-                lock_key = f'celery_task_run_bot_lock_{account.id}'
-                task_id = redis_client.get(lock_key)
+            # Only the ids are needed to look up each account's lock
+            account_ids = list(queryset.values_list('id', flat=True))
+            # Fetch every lock in one round trip
+            task_ids = redis_client.mget(
+                [f'celery_task_run_bot_lock_{account_id}' for account_id in account_ids]
+            ) if account_ids else []
+
+            for account_id, task_id in zip(account_ids, task_ids):
                 # Trust the lock as source of truth - if lock exists, bot is running
                 # Don't delete locks here - let the task clean up when it finishes
                 is_running = task_id is not None
 
-                statuses[account.id] = {
+                statuses[account_id] = {
                     'is_running': is_running,
                     'status': 'running' if is_running else 'idle',
                     'task_id': task_id if is_running else None
@@ -20,23 +20,27 @@ def cleanup_stale_locks(sender, **kwargs):
     This handles the case where the worker was killed/restarted while tasks were running.
     """
     try:
-        from django.conf import settings
-        import redis
-
-        redis_client = redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
-
-        # Find all bot locks
-        lock_keys = redis_client.keys('celery_task_run_bot_lock_*')
-        stop_flag_keys = redis_client.keys('bot_stop_flag_*')
-
-        if lock_keys or stop_flag_keys:
-            # Delete all stale locks and stop flags
-            all_keys = lock_keys + stop_flag_keys
-            if all_keys:
-                deleted = redis_client.delete(*all_keys)
-                logger.warning(f"Cleaned up {deleted} stale bot locks/flags on worker startup: {all_keys}")
+        from core.utils.redis_client import redis_client, ACTIVE_BOT_LOCKS_KEY, ACTIVE_BOT_STOP_FLAGS_KEY
+
+        # Bot locks and stop flags are indexed in two sets when they are set, so read
+        # those instead of scanning the keyspace. Members whose key already expired
+        # or was deleted are harmless here.
+        index_keys = (ACTIVE_BOT_LOCKS_KEY, ACTIVE_BOT_STOP_FLAGS_KEY)
+        all_keys = [
+            key
+            for index_key in index_keys
+            for key in redis_client.sscan_iter(index_key, count=500)
+        ]
+
+        if all_keys:
+            # Delete all stale locks and stop flags in batches (UNLINK frees memory in the background)
+            deleted = 0
+            for start in range(0, len(all_keys), 500):
+                deleted += redis_client.unlink(*all_keys[start:start + 500])
+            logger.warning(f"Cleaned up {deleted} stale bot locks/flags on worker startup: {all_keys}")
         else:
             logger.info("No stale bot locks found on worker startup")
+        redis_client.delete(*index_keys)
 
     except Exception as e:
         logger.error(f"Error cleaning up stale locks on worker startup: {e}")
\ No newline at end of file
@@ -140,6 +140,9 @@ REST_FRAMEWORK = {
 # Bot execution interval in seconds (how often bot runs when started)
 BOT_EXECUTION_INTERVAL = 30  # Default: 60 seconds (1 minute)
 
+# Frontend base URL used to build payment links
+FRONTEND_BASE_URL = os.environ.get('FRONTEND_BASE_URL', 'http://localhost:5173')
+
 # Telegram configurations
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('merchants', '0013_extractedtransactions_queued_bank_index'),
+        ('settlements', '0004_settlementaccount_account_type'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='settlement',
+            name='settlements_merchan_df3a89_idx',
+        ),
+        migrations.AddIndex(
+            model_name='settlement',
+            index=models.Index(fields=['merchant', 'status', '-created_at'], name='settlements_merchan_5c97f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='settlement',
+            index=models.Index(fields=['merchant', '-created_at'], name='settlements_merchan_685c89_idx'),
+        ),
+    ]
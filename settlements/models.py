@@ -207,8 +207,10 @@ class Settlement(SoftDeleteModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status']),
-            models.Index(fields=['merchant']),
             models.Index(fields=['created_at']),
+            # Merchant-scoped listing (newest first), optionally filtered by status
+            models.Index(fields=['merchant', 'status', '-created_at']),
+            models.Index(fields=['merchant', '-created_at']),
         ]
 
     def __str__(self):
@@ -222,8 +224,9 @@ class Settlement(SoftDeleteModel):
 
     def save(self, *args, **kwargs):
         """Override save to snapshot account details"""
-        # If to_settlement_account is provided and bank details are not set, copy them
-        if self.to_settlement_account and not self.bank_account_number:
+        # On insert, if to_settlement_account is provided and bank details are not set,
+        # copy them (later saves, e.g. status updates, never load the account)
+        if self._state.adding and self.to_settlement_account_id and not self.bank_account_number:
             if self.to_settlement_account.instrument_type == 'bank':
                 self.bank_account_holder_name = self.to_settlement_account.account_holder_name
                 self.bank_account_number = self.to_settlement_account.account_number
@@ -1,13 +1,30 @@
 from rest_framework import serializers
-from .models import SettlementAccount, Settlement
+from .models import (
+    SettlementAccount,
+    Settlement,
+    INSTRUMENT_CHOICES,
+    SETTLEMENT_STATUS_CHOICES,
+    ACCOUNT_TYPE_CHOICES,
+)
+
+
+class ChoiceDisplayField(serializers.ReadOnlyField):
+    """Read-only label for a choice value, looked up in a map built once per field"""
+
+    def __init__(self, choices, **kwargs):
+        self.labels = dict(choices)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return self.labels.get(value, value)
 
 
 class SettlementAccountSerializer(serializers.ModelSerializer):
     """Serializer for SettlementAccount model (read operations)"""
     merchant_name = serializers.CharField(source='merchant.name', read_only=True)
     merchant_code = serializers.CharField(source='merchant.code', read_only=True)
-    instrument_type_display = serializers.CharField(source='get_instrument_type_display', read_only=True)
-    account_type_display = serializers.CharField(source='get_account_type_display', read_only=True)
+    instrument_type_display = ChoiceDisplayField(INSTRUMENT_CHOICES, source='instrument_type')
+    account_type_display = ChoiceDisplayField(ACCOUNT_TYPE_CHOICES, source='account_type')
 
     class Meta:
         model = SettlementAccount
@@ -84,8 +101,8 @@ class SettlementSerializer(serializers.ModelSerializer):
     """Serializer for Settlement model (read operations)"""
     merchant_name = serializers.CharField(source='merchant.name', read_only=True)
     merchant_code = serializers.CharField(source='merchant.code', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    method_display = serializers.CharField(source='get_method_display', read_only=True)
+    status_display = ChoiceDisplayField(SETTLEMENT_STATUS_CHOICES, source='status')
+    method_display = ChoiceDisplayField(INSTRUMENT_CHOICES, source='method')
     settlement_account_nickname = serializers.CharField(
         source='settlement_account.nickname',
         read_only=True,
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from .models import SettlementAccount, Settlement
 from core.utils.multi_tenant import filter_by_user_merchants
+from core.utils.pagination import get_page_params, paginate
 from .serializer import (
     SettlementAccountSerializer,
     SettlementAccountCreateSerializer,
@@ -13,6 +14,22 @@ from .serializer import (
     SettlementUpdateSerializer
 )
 
+# Relations read by SettlementSerializer (merchant name/code and both accounts)
+SETTLEMENT_RELATED = ('merchant', 'settlement_account', 'to_settlement_account')
+
+# Columns SettlementSerializer reads, so the list skips the rest of the joined rows
+SETTLEMENT_LIST_FIELDS = (
+    'id', 'merchant_id', 'settlement_account_id', 'to_settlement_account_id',
+    'amount', 'status', 'method',
+    'bank_account_holder_name', 'bank_account_number', 'bank_ifsc_code',
+    'reference_id', 'notes', 'created_at', 'updated_at',
+    'merchant__name', 'merchant__code',
+    'settlement_account__nickname', 'settlement_account__account_holder_name',
+    'settlement_account__account_number', 'settlement_account__ifsc_code',
+    'to_settlement_account__nickname', 'to_settlement_account__account_holder_name',
+    'to_settlement_account__account_number', 'to_settlement_account__ifsc_code',
+)
+
 
 class SettlementAccountListView(APIView):
     """
@@ -24,7 +41,7 @@ class SettlementAccountListView(APIView):
 
     def get(self, request):
         """Get list of all settlement accounts (excluding soft-deleted) with optional filters"""
-        queryset = SettlementAccount.objects.filter(deleted_at=None)
+        queryset = SettlementAccount.objects.filter(deleted_at=None).select_related('merchant')
 
         # Filter by user's accessible merchants (multi-tenant)
         queryset = filter_by_user_merchants(queryset, request.user, 'merchant')
@@ -46,14 +63,13 @@ class SettlementAccountListView(APIView):
 
         serializer = SettlementAccountSerializer(queryset, many=True)
         return Response({
-            'count': queryset.count(),
+            'count': len(serializer.data),
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
     def post(self, request):
         """Create a new settlement account"""
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role in ['super_admin', 'admin']):
+        if not request.user.is_admin_or_super_admin:
             return Response({
                 'error': 'Only admins can create settlement accounts'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -78,13 +94,13 @@ class SettlementAccountDetailView(APIView):
 
     def get(self, request, pk):
         """Get a specific settlement account by ID"""
-        settlement_account = get_object_or_404(SettlementAccount, pk=pk, deleted_at=None)
+        settlement_account = get_object_or_404(SettlementAccount.objects.select_related('merchant'), pk=pk, deleted_at=None)
         serializer = SettlementAccountSerializer(settlement_account)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         """Full update of a settlement account"""
-        settlement_account = get_object_or_404(SettlementAccount, pk=pk, deleted_at=None)
+        settlement_account = get_object_or_404(SettlementAccount.objects.select_related('merchant'), pk=pk, deleted_at=None)
         serializer = SettlementAccountCreateSerializer(settlement_account, data=request.data)
         serializer.is_valid(raise_exception=True)
         updated_account = serializer.save()
@@ -93,7 +109,7 @@ class SettlementAccountDetailView(APIView):
 
     def patch(self, request, pk):
         """Partial update of a settlement account"""
-        settlement_account = get_object_or_404(SettlementAccount, pk=pk, deleted_at=None)
+        settlement_account = get_object_or_404(SettlementAccount.objects.select_related('merchant'), pk=pk, deleted_at=None)
         serializer = SettlementAccountCreateSerializer(settlement_account, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         updated_account = serializer.save()
@@ -119,7 +135,9 @@ class SettlementListView(APIView):
 
     def get(self, request):
         """Get list of all settlements (excluding soft-deleted) with optional filters"""
-        queryset = Settlement.objects.filter(deleted_at=None)
+        queryset = Settlement.objects.filter(deleted_at=None).select_related(
+            *SETTLEMENT_RELATED
+        ).only(*SETTLEMENT_LIST_FIELDS)
 
         # Filter by user's accessible merchants (multi-tenant)
         queryset = filter_by_user_merchants(queryset, request.user, 'merchant')
@@ -136,16 +154,29 @@ class SettlementListView(APIView):
         if settlement_status:
             queryset = queryset.filter(status=settlement_status)
 
-        serializer = SettlementSerializer(queryset, many=True)
+        # Order by created_at descending (newest first)
+        queryset = queryset.order_by('-created_at')
+
+        # Pagination
+        page, page_size = get_page_params(request.query_params)
+        results, total_count = paginate(queryset, page, page_size)
+
+        serializer = SettlementSerializer(results, many=True)
+
+        # Calculate total pages
+        total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
+
         return Response({
-            'count': queryset.count(),
+            'count': total_count,
+            'page': page,
+            'page_size': page_size,
+            'total_pages': total_pages,
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
     def post(self, request):
         """Create a new settlement"""
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role in ['super_admin', 'admin']):
+        if not request.user.is_admin_or_super_admin:
             return Response({
                 'error': 'Only admins can create settlements'
             }, status=status.HTTP_403_FORBIDDEN)
@@ -169,13 +200,13 @@ class SettlementDetailView(APIView):
 
     def get(self, request, pk):
         """Get a specific settlement by ID"""
-        settlement = get_object_or_404(Settlement, pk=pk, deleted_at=None)
+        settlement = get_object_or_404(Settlement.objects.select_related(*SETTLEMENT_RELATED), pk=pk, deleted_at=None)
         serializer = SettlementSerializer(settlement)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def patch(self, request, pk):
         """Update settlement status and reference"""
-        settlement = get_object_or_404(Settlement, pk=pk, deleted_at=None)
+        settlement = get_object_or_404(Settlement.objects.select_related(*SETTLEMENT_RELATED), pk=pk, deleted_at=None)
         serializer = SettlementUpdateSerializer(settlement, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         updated_settlement = serializer.save()
@@ -200,17 +231,17 @@ class SettlementResetView(APIView):
 
     def post(self, request, pk):
         """Reset settlement status to pending"""
-        settlement = get_object_or_404(Settlement, pk=pk, deleted_at=None)
-
-        user_role = request.user.role.lower() if request.user.role else ''
-        if not (request.user.is_superuser or user_role in ['super_admin', 'admin']):
+        # Reject non-admins before loading the settlement and its accounts
+        if not request.user.is_admin_or_super_admin:
             return Response({
                 'error': 'Only admins can reset settlements'
             }, status=status.HTTP_403_FORBIDDEN)
 
+        settlement = get_object_or_404(Settlement.objects.select_related(*SETTLEMENT_RELATED), pk=pk, deleted_at=None)
+
         settlement.status = 'pending'
         settlement.reference_id = None
-        settlement.save()
+        settlement.save(update_fields=['status', 'reference_id', 'updated_at'])
 
         response_serializer = SettlementSerializer(settlement)
         return Response(response_serializer.data, status=status.HTTP_200_OK)